@@ -1,443 +1,506 @@
-#-------------------------------------------------------------------------------
-# Name:         DEM_PredisturbanceGeneration_AreaVolumeCalc_Batch_NN_Py3.py
-#
-# Purpose:      Takes existing high-resolution DEMs and slump shapefiles (polygons) to model predisturbance elevations for the goal of obtaining DEMs of Difference and slump area/volume estimates.
-#               If delineations reflect real disturbances the DOD metrics relate to slump structural estimates, such as volume and average depth-of-thaw.
-#               If delineations reflect undisturbed locations the DOD metrics relate to the accuracy and precision to which undisturbed topography can be recreated using neighbouring elevation measurements and Natural Neighbour re-interpolation.
-#               Script will work on multiple shapefile input files.
-#
-# Output        Database file (DBF) created through ESRI ArcGIS Pro "Zonal Statistics" tool, with pixel counts and various DOD metrics (min, max, range, mean, standard deviation, median, 90th percentile distribution, and SUM.
-#               The metric "SUM" represents slump volume if the inputs reflect real disturbances and should be a negative value when correct. SUM represents volumetric uncertainty if using synthetic data voids.
-#               Outputs can be found in 06_FinalZonalStats and 07_FinalRMSEStats folders. The latter folder is irrelevant if working with real disturbances. If the input vector data concerns multiple shapefiles a DBF file is produced for each shapefile, along with a merged BDF file combining all features.
-#               Please refer to the following publication for more information: Van der Sluijs et al., Allometric scaling of retrogressive thaw slumps, Cryosphere Discussions (in review): https://tc.copernicus.org/preprints/tc-2022-149/
-#
-# Author:       Jurjen van der Sluijs, Unmanned Aircraft Systems Coordinator, NWT Centre for Geomatics, Yellowknife, Northwest Territories, Canada (jurjen_vandersluijs@gov.nt.ca)
-#
-# Created:      17/07/2019 (Original). Last metadata edits (02/09/2023)
-#
-# Licence:      CC Attribution-NonCommercial-ShareAlike (CC BY-NC-SA)
-#               Remix, tweak, build upon this work is allowed non-commercially and license new creations under identical terms.
-#
-# Citation:     Developed for the following preprint: Van der Sluijs et al., Allometric scaling of retrogressive thaw slumps, Cryosphere Discussions (in review): https://tc.copernicus.org/preprints/tc-2022-149/
-#               Use associated final peer-reviewed article where possible.
-#
-# Dependencies:
-#               • Developed and tested using ESRI ArcGIS Pro v2.7 to v2.9 with ArcPy, Spatial Analyst or 3D Analyst
-#               • Developed and tested using Python 3.7.11 [MSC v.1927 64 bit (AMD64)] on win32
-#
-# Considerations:
-#               • Shapefile must have a “UniqueID” attribute.
-#               • Shapefile is allowed to have overlapping polygons, which normally provide erroneous ArcGIS Zonal Statistics as Table results as polygons are normally rasterized before raster statistics are generated.
-#                 In the provided Python code features are processed iteratively in batch mode, thus this limitation has been overcome.
-#               • If the spatial resolution of the input DEM is not 1 m, a multiplication is required in order to derive volumes in cubic metres. For example, for the 2 m resolution ArcticDEM this factor is 2 x 2 = 4.
-#                 For a 3 m DEM such as MVAP this factor is 3 x 3 = 9. This functionality is not included in the code and needs to be applied afterwards.
-#
-# More information:
-#                   • Preprint: Van der Sluijs et al., Allometric scaling of retrogressive thaw slumps, Cryosphere Discussions (in review): https://tc.copernicus.org/preprints/tc-2022-149/
-#                   • Supplement associated with preprint.
-
-## System definitions and extension sign-outs - DO NOT CHANGE
-print("Start initializing")
-import sys, os, subprocess, arcpy, glob, os.path, time, math, shutil
-print("Import OS SYS ARCPY good")
-from subprocess import Popen, PIPE
-print("Import SubProcess good")
-from arcpy import env
-print("Import ENV good")
-from arcpy.sa import *
-print("Import Spatial Analyst good")
-from time import localtime, strftime
-print("Import Time good")
-print("")
-
-try:
-    if arcpy.CheckExtension("Spatial") == "Available":
-        arcpy.CheckOutExtension("Spatial")
-    else:
-        # raise a custom exception
-        raise LicenseError
-except LicenseError:
-    print("Spatial Analyst license is unavailable")
-
-try:
-    if arcpy.CheckExtension("3D") == "Available":
-        arcpy.CheckOutExtension("3D")
-    else:
-        # raise a custom exception
-        raise LicenseError
-except LicenseError:
-    print("3D Analyst license is unavailable")
-
-env.overwriteOutput = True
-totalstart = time.clock()
-print("Initialization Complete. Start time:",time.strftime("%c", time.localtime()))
-print("")
-
-# Set Variables - Change as Needed
-env.workspace  =    r"C:\Workspace"             # Full path to input shapefile deliniations of slumps
-inputDEM = r"C:\Workspace\DEMs\DEM.tif"         # Full path to input high resolution DEM (Geotif), which can represents topography in disturbed or undisturbed state (see Purpose)
-DEMres   =    1.0    # in meters                # In Step 5 adjust string "CELLSIZE 1.0" appropriately if the DEM does not have a spatial resolution of 1 m.
-IDattribute = 3                                 # The integer location of the column 'UniqueID' in the attribute table, following a n-1 naming convention with Python lists. (E.g., 11th column is the 10th attribute in the list including the standard columns such as FID and Shape. Enter "10" in this case)
-
-# Initiate loop
-inputVector = arcpy.ListFeatureClasses()
-wspace = env.workspace
-print("The following vector files will be considered: " + str(inputVector))
-
-for slumpset in inputVector:
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 1: Buffer slump digitizations by 50 m
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-    ## Shorten and reset workspace string for every iteration
-    arcpy.env.workspace = wspace
-
-    print(time.strftime("%X", time.localtime()), "  Start slump buffering")
-    buf_start = time.clock()
-
-    ### string for the output buffered digitizations folder
-    bufFolder_name =          "00_SlumpBuffers"
-    newrawpath = os.path.join(env.workspace, bufFolder_name)
-    if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-    bufFolder_joined = os.path.join(env.workspace, bufFolder_name)
-
-    ### Prepare output file name
-    desc = arcpy.Describe(slumpset)
-    outputVector = bufFolder_joined + "\\" + desc.baseName + "_50m_buf.shp"
-
-    arcpy.Buffer_analysis(slumpset, outputVector , "50 Meters", "FULL", "ROUND", "NONE")
-
-    ### Report happy ending for buffer
-    buf_end = time.clock()
-    buf_elapsed = buf_end - buf_start
-    buf_elapsedmin = buf_elapsed / 60
-    buf_elapsedhr = buf_elapsedmin / 60
-    print(time.strftime("%X", time.localtime()), "  buffer ran successfully")
-    print("Buffer processing time: " + str(round(buf_elapsed,0)) + " seconds " + " or " + str(round(buf_elapsedmin,1)) + " minutes " + " or " + str(round(buf_elapsedhr,4)) + " hours ")
-    print(" ")
-
-    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-    # Step 2: Clip Input DEM to minimum bounding rectangle of buffered slump and convert to point shapefile
-    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-    print(time.strftime("%X", time.localtime()), "  Start DEM Clip")
-    clip_start = time.clock()
-
-    ### string for the output clipped DEM folder
-    clipFolder_name =          "01_ClippedDEMs"
-    newrawpath = os.path.join(env.workspace, clipFolder_name)
-    if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-    clipFolder_joined = os.path.join(env.workspace, clipFolder_name)
-
-    ## Prepare slump naming convention by iteratively pulling values from attribute table, then clipping individual DEMs based on FOR-loop
-    shapeName = arcpy.Describe(outputVector).shapeFieldName
-    fieldnames = [field.name for field in arcpy.ListFields(outputVector)]
-    cursor = arcpy.SearchCursor(outputVector,['UniqueID'])
-    for row in cursor:
-
-        ## Parse UniqueID for further file naming
-        rowclean = row.getValue(fieldnames[IDattribute])       ## Here UniqueID is the n-th field in the attribute table; n-1 naming convention with Python lists. (E.g., 11th column is the 10th attribute in the list)
-        slumpname = "_SlumpID_" + str(rowclean)
-
-        ## Retrieve inputDEM raster name from which to concatenate with slump name and output path for output files
-        descDEM = arcpy.Describe(inputDEM)
-        clipDEMname = desc.baseName + slumpname + ".tif"
-        clipDEMoutput = clipFolder_joined + "\\" + clipDEMname
-
-        ## Obtain the extent of each feature
-        feat = row.getValue(shapeName)
-        extent = feat.extent
-        extentstr = str('{} {} {} {}'.format(extent.XMin, extent.YMin, extent.XMax, extent.YMax))
-
-        print(slumpname)
-        print(extentstr)
-
-        ## Clip the DEM based on invidual extent
-        arcpy.Clip_management(inputDEM, extentstr,clipDEMoutput, "", "-9999", "NONE", "NO_MAINTAIN_EXTENT")
-        print(clipDEMname + " successfully clipped")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 3: Convert clipped DEMs to points
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-        ## Prepare slump naming convention
-        postpointsDEMname = desc.baseName + slumpname + "_points_post"
-        postpointsDEMoutput = r"memory" + "\X" + postpointsDEMname
-
-        ## Convert clupped DEMs to points
-        arcpy.RasterToPoint_conversion(clipDEMoutput, postpointsDEMoutput, "VALUE")
-        print(postpointsDEMname + " successfully processed")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 4: Select by location and remove points
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-        ## Prepare slump naming convention for interpreter
-        prepointsDEMname = desc.baseName + slumpname + "_points_pre"
-
-        ## Create a temporary layer for selection of points and the respective slump area (cannot rely solely on a Select by Location/intersect in case of overlapping randomized slump areas)
-        tempPoints = "pointsLayer"
-        tempArea = "areaLayer"
-        arcpy.MakeFeatureLayer_management(postpointsDEMoutput, tempPoints)
-        arcpy.MakeFeatureLayer_management(slumpset, tempArea)
-
-        ## Select by attribute for correct slump area
-        whereClause = '"UniqueID" = ' + str(rowclean)
-        print(whereClause)
-        arcpy.SelectLayerByAttribute_management(tempArea,'NEW_SELECTION',whereClause)
-
-        ## Select by location and delete points
-        arcpy.SelectLayerByLocation_management(tempPoints, "Intersect",tempArea)
-        arcpy.DeleteFeatures_management(tempPoints)
-
-        ## Save left-over points to new feature class
-        print(prepointsDEMname + " successfully processed")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 5: Reinterpolate clipped points to create pre-disturbance model
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-        ### string for the output predisturbance DEM folder
-        predisFolder_name =          "02_PredisturbDEMs"
-        newrawpath = os.path.join(env.workspace, predisFolder_name)
-        if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-        predisFolder_joined = os.path.join(env.workspace, predisFolder_name)
-
-        ## Retrieve inputDEM raster name from which to concatenate with slump name and predisturbance DEM
-        predisTINname = desc.baseName + slumpname + "_predisturbanceTIN"
-        predisTINoutput = predisFolder_joined + "\\" + predisTINname
-
-        predisDEMname = desc.baseName + slumpname + "_predisturbance.tif"
-        predisDEMoutput = predisFolder_joined + "\\" + predisDEMname
-
-        ## Concatename in_features string for TIN parameters and describe spatial reference for TIN output
-        featuresTIN = postpointsDEMoutput + " GRID_CODE Mass_Points <None>"
-        spref = arcpy.Describe(clipDEMoutput).spatialReference
-
-        ## Execute NN interpolation to obtain predisturbance DEM
-        arcpy.CreateTin_3d(predisTINoutput,spref, featuresTIN, "DELAUNAY")
-        arcpy.TinRaster_3d(predisTINoutput, predisDEMoutput,"FLOAT","NATURAL_NEIGHBORS","CELLSIZE 1.0","1")
-        arcpy.Delete_management(postpointsDEMoutput)
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 6: Create DOD through Raster Algebra
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-        ### string for the output DOD folder
-        dodFolder_name =          "03_DODs"
-        newrawpath = os.path.join(env.workspace, dodFolder_name)
-        if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-        dodFolder_joined = os.path.join(env.workspace, dodFolder_name)
-
-        ## Retrieve inputDEM raster name from which to concatenate with slump name and predisturbance DEM to name DOD raster
-        dodname = desc.baseName + slumpname + "_dod.tif"
-        dodoutput = dodFolder_joined + "\\" + dodname
-
-        ## Execute Raster Algebra for DOD
-        outMinus = Minus(clipDEMoutput, predisDEMoutput)
-        outMinus.save(dodoutput)
-        arcpy.CalculateStatistics_management(dodoutput, "", "", "")
-
-        print(dodname + " successfully processed")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 7: Create Summary Statistics of area and volume through Zonal Statistics
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-        ### string for the output Zonal Statistics folder
-        zsFolder_name =          "04_IndZonalStats_" + desc.baseName
-        newrawpath = os.path.join(env.workspace, zsFolder_name)
-        if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-        zsFolder_joined = os.path.join(env.workspace, zsFolder_name)
-
-        ## Retrieve inputDEM raster name from which to concatenate with slump name and DOD raster to name Zonal Statistics table
-        iTablename = desc.baseName + slumpname + "_zs.dbf"
-        iTableoutput = zsFolder_joined + "\\" + iTablename
-
-        ## Select by Attribute on slump name to ensure that only the feature itself is used (closely located slumps cause multiple records for each when merged; next step). Start with temporary layer creation, then concatenation of SQL query string before running zonal statistics tool.
-
-        ## Create a temporary layer for selection
-        zoneLayer = "zone"
-        arcpy.MakeFeatureLayer_management(slumpset, zoneLayer)
-
-        ## Concatenate query
-        qry = ""'UniqueID'" = " + str(rowclean) + " "
-
-        ## Select by Attribute
-        arcpy.SelectLayerByAttribute_management(zoneLayer, "NEW_SELECTION",qry)
-
-        ## Run Zonal Statistics as a Table for each individual unbuffered feature
-        arcpy.gp.ZonalStatisticsAsTable_sa(zoneLayer, "UniqueID", dodoutput, iTableoutput, "DATA", "ALL")
-
-        print(iTablename + " successfully processed")
-        print("")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 8: Calculate RMSE and save as table
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-        ### string for the output Zonal Statistics folder
-        rmseFolder_name =          "05_IndRMSEStats_" + desc.baseName
-        newrawpath = os.path.join(env.workspace, rmseFolder_name)
-        if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-        rmseFolder_joined = os.path.join(env.workspace, rmseFolder_name)
-
-        ## Retrieve inputDEM raster name from which to concatenate with slump name and DOD raster to name Zonal Statistics table
-        rmseTablename = desc.baseName + slumpname + "_rmse.dbf"
-        rmseTableoutput = rmseFolder_joined + "\\" + rmseTablename
-
-        ## Retrieve inputDEM raster name from which to concatenate with slump name to name squared DOD raster
-        dodsqname = desc.baseName + slumpname + "_dodsq.tif"
-        dodsqoutput = dodFolder_joined + "\\" + dodsqname
-
-        ## Execute Raster Algebra for RMSE
-        outSquare = Square(dodoutput)
-        outSquare.save(dodsqoutput)
-        arcpy.CalculateStatistics_management(dodsqoutput, "", "", "")
-
-        print(dodsqname + " successfully processed")
-
-        ## Select by Attribute on slump name to ensure that only the feature itself is used (closely located slumps cause multiple records for each when merged; next step). Start with temporary layer creation, then concatenation of SQL query string before running zonal statistics tool.
-
-        ## Create a temporary layer for selection
-        zoneLayer = "zone"
-        arcpy.MakeFeatureLayer_management(slumpset, zoneLayer)
-
-        ## Concatenate query
-        qry = ""'UniqueID'" = " + str(rowclean) + " "
-
-        ## Select by Attribute
-        arcpy.SelectLayerByAttribute_management(zoneLayer, "NEW_SELECTION",qry)
-
-        ## Run Zonal Statistics as a Table for each individual unbuffered feature
-        arcpy.gp.ZonalStatisticsAsTable_sa(zoneLayer, "UniqueID", dodsqoutput, rmseTableoutput, "DATA", "MEAN")
-
-        print(rmseTablename + " successfully processed")
-        print("")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 9: Create Summary Statistics through Zonal Statistics and merge per iteration
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-    ### string for the output Zonal Statistics folder
-    fzsFolder_name =          "06_FinalZonalStats"
-    newrawpath = os.path.join(env.workspace, fzsFolder_name)
-    if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-    fzsFolder_joined = os.path.join(env.workspace, fzsFolder_name)
-
-    ## Retrieve a list of tables with statistics of each individual slump
-    arcpy.env.workspace = zsFolder_joined
-    tableList = arcpy.ListTables()
-
-    print("The following tables will be merged:")
-    for table in tableList:
-        print(table)
-
-    ## Retrieve input vector name from which to concatenate with final statistics name for merged DBF table output
-    fTablename = desc.baseName +  "_FinalStatistics" + ".dbf"
-    fTableoutput = fzsFolder_joined + "\\" + fTablename
-
-    ## Merge list of tables in final table output
-    arcpy.Merge_management(tableList,fTableoutput)
-
-    print(fTablename + " successfully processed")
-    print("")
-
-    ### Report happy ending for iteration
-    clip_end = time.clock()
-    clip_elapsed = clip_end - clip_start
-    clip_elapsedmin = clip_elapsed / 60
-    clip_elapsedhr = clip_elapsedmin / 60
-    print(time.strftime("%X", time.localtime()), "  iteration ran successfully")
-    print("Area/volume processing time for iteration: " + str(round(clip_elapsed,0)) + " seconds " + " or " + str(round(clip_elapsedmin,1)) + " minutes " + " or " + str(round(clip_elapsedhr,4)) + " hours ")
-    print(" ")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 10: Create Summary Statistics through Zonal Statistics and merge per iteration
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-    ## Shorten and reset workspace string for every iteration
-    arcpy.env.workspace = wspace
-
-    ### string for the output Zonal Statistics folder
-    frmseFolder_name =          "07_FinalRMSEStats"
-    newrawpath = os.path.join(env.workspace, frmseFolder_name)
-    if not os.path.exists(newrawpath): os.makedirs(newrawpath)
-    frmseFolder_joined = os.path.join(env.workspace, frmseFolder_name)
-
-    ## Retrieve a list of tables with statistics of each individual slump
-    arcpy.env.workspace = rmseFolder_joined
-    rmsetableList = arcpy.ListTables()
-
-    print("The following tables will be merged:")
-    for rmsetable in rmsetableList:
-        print(rmsetable)
-
-    ## Retrieve input vector name from which to concatenate with final statistics name for merged DBF table output
-    frmseTablename = desc.baseName +  "_FinalRMSE" + ".dbf"
-    frmseTableoutput = frmseFolder_joined + "\\" + frmseTablename
-
-    ## Merge list of tables in final table output
-    arcpy.Merge_management(rmsetableList,frmseTableoutput)
-
-    print(frmseTablename + " successfully processed")
-    print("")
-
-    ### Report happy ending for iteration
-    clip_end = time.clock()
-    clip_elapsed = clip_end - clip_start
-    clip_elapsedmin = clip_elapsed / 60
-    clip_elapsedhr = clip_elapsedmin / 60
-    print(time.strftime("%X", time.localtime()), "  iteration ran successfully")
-    print("Area/volume processing time for iteration: " + str(round(clip_elapsed,0)) + " seconds " + " or " + str(round(clip_elapsedmin,1)) + " minutes " + " or " + str(round(clip_elapsedhr,4)) + " hours ")
-    print(" ")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 11: Merge zonal statistics of all iterations together
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-## Retrieve a list of tables with statistics of each individual slump
-arcpy.env.workspace = fzsFolder_joined
-fsTableList = arcpy.ListTables()
-
-print("The following tables will be merged:")
-print(fsTableList)
-
-## Retrieve input vector name from which to concatenate with final statistics name for merged DBF table output
-fsTablename = desc.baseName +  "_FinalStatistics_merged" + ".dbf"
-fsTableoutput = fzsFolder_joined + "\\" + fsTablename
-
-## Merge list of tables in final table output
-arcpy.Merge_management(fsTableList,fsTableoutput)
-
-print(fsTablename + " successfully processed")
-print("")
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-# Step 12: Merge RMSE statistics of all iterations together
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
-
-## Retrieve a list of tables with statistics of each individual slump
-arcpy.env.workspace = frmseFolder_joined
-fmrmseTableList = arcpy.ListTables()
-
-print("The following tables will be merged:")
-print(fmrmseTableList)
-
-## Retrieve input vector name from which to concatenate with final statistics name for merged DBF table output
-fmrmseTablename = desc.baseName +  "_FinalRMSE_merged" + ".dbf"
-fmrmseTableoutput = frmseFolder_joined + "\\" + fmrmseTablename
-
-## Merge list of tables in final table output
-arcpy.Merge_management(fmrmseTableList,fmrmseTableoutput)
-
-print(fmrmseTablename + " successfully processed")
-print("")
-
-### Report happy ending for iteration
-totalend = time.clock()
-total_elapsed = totalend - totalstart
-total_elapsedmin = total_elapsed / 60
-total_elapsedhr = total_elapsedmin / 60
-print(time.strftime("%X", time.localtime()), "  script ran successfully")
-print("Area/volume processing time for script: " + str(round(total_elapsed,0)) + " seconds " + " or " + str(round(total_elapsedmin,1)) + " minutes " + " or " + str(round(total_elapsedhr,4)) + " hours ")
-print(" ")
\ No newline at end of file
+#-------------------------------------------------------------------------------
+# Name:         DEM_PredisturbanceGeneration_AreaVolumeCalc_Batch_NN_Py3.py
+#
+# Purpose:      Takes existing high-resolution DEMs and slump shapefiles (polygons) to model predisturbance elevations for the goal of obtaining DEMs of Difference and slump area/volume estimates.
+#               If delineations reflect real disturbances the DOD metrics relate to slump structural estimates, such as volume and average depth-of-thaw.
+#               If delineations reflect undisturbed locations the DOD metrics relate to the accuracy and precision to which undisturbed topography can be recreated using neighbouring elevation measurements and Natural Neighbour re-interpolation.
+#               Script will work on multiple shapefile input files.
+#
+# Output        Comma-separated table (CSV) with pixel counts and various DOD metrics (min, max, range, mean, standard deviation, median, 90th percentile distribution, and SUM.
+#               The metric "SUM" represents slump volume if the inputs reflect real disturbances and should be a negative value when correct. SUM represents volumetric uncertainty if using synthetic data voids.
+#               Outputs can be found in 06_FinalZonalStats and 07_FinalRMSEStats folders. The latter folder is irrelevant if working with real disturbances. If the input vector data concerns multiple shapefiles a CSV file is produced for each shapefile, along with a merged CSV file combining all features.
+#               Please refer to the following publication for more information: Van der Sluijs et al., Allometric scaling of retrogressive thaw slumps, Cryosphere Discussions (in review): https://tc.copernicus.org/preprints/tc-2022-149/
+#
+# Author:       Jurjen van der Sluijs, Unmanned Aircraft Systems Coordinator, NWT Centre for Geomatics, Yellowknife, Northwest Territories, Canada (jurjen_vandersluijs@gov.nt.ca)
+#
+# Created:      17/07/2019 (Original). Last metadata edits (02/09/2023)
+#
+# Licence:      CC Attribution-NonCommercial-ShareAlike (CC BY-NC-SA)
+#               Remix, tweak, build upon this work is allowed non-commercially and license new creations under identical terms.
+#
+# Citation:     Developed for the following preprint: Van der Sluijs et al., Allometric scaling of retrogressive thaw slumps, Cryosphere Discussions (in review): https://tc.copernicus.org/preprints/tc-2022-149/
+#               Use associated final peer-reviewed article where possible.
+#
+# Dependencies:
+#               • Requires NumPy, SciPy, Pandas, Rasterio, GeoPandas and Shapely; no ESRI ArcGIS Pro licence is needed
+#               • Developed and tested using Python 3.7.11 [MSC v.1927 64 bit (AMD64)] on win32
+#
+# Considerations:
+#               • Shapefile must have a “UniqueID” attribute.
+#               • Shapefile is allowed to have overlapping polygons, which normally provide erroneous ArcGIS Zonal Statistics as Table results as polygons are normally rasterized before raster statistics are generated.
+#                 In the provided Python code features are processed iteratively in batch mode, thus this limitation has been overcome.
+#               • If the spatial resolution of the input DEM is not 1 m, a multiplication is required in order to derive volumes in cubic metres. For example, for the 2 m resolution ArcticDEM this factor is 2 x 2 = 4.
+#                 For a 3 m DEM such as MVAP this factor is 3 x 3 = 9. This functionality is not included in the code and needs to be applied afterwards.
+#
+# More information:
+#                   • Preprint: Van der Sluijs et al., Allometric scaling of retrogressive thaw slumps, Cryosphere Discussions (in review): https://tc.copernicus.org/preprints/tc-2022-149/
+#                   • Supplement associated with preprint.
+
+## System definitions - DO NOT CHANGE
+print("Start initializing")
+import sys, os, subprocess, glob, os.path, time, math, shutil
+print("Import OS SYS good")
+from subprocess import Popen, PIPE
+print("Import SubProcess good")
+import concurrent.futures
+print("Import Concurrent Futures good")
+import numpy as np
+print("Import NumPy good")
+import pandas as pd
+print("Import Pandas good")
+import rasterio
+import rasterio.shutil
+from rasterio.windows import Window, from_bounds
+from rasterio.features import rasterize
+print("Import Rasterio good")
+from scipy.spatial import Delaunay, cKDTree
+from scipy.interpolate import LinearNDInterpolator
+print("Import SciPy good")
+import geopandas as gpd
+print("Import GeoPandas good")
+
+try:
+    from numba import njit, prange
+    numbaAvailable = True
+    print("Import Numba good")
+except ImportError:
+    numbaAvailable = False
+    print("Numba is unavailable; IDW fill falls back to NumPy broadcasting")
+print("")
+
+# Set Variables - Change as Needed
+wspace   =    r"C:\Workspace"                   # Full path to input shapefile deliniations of slumps
+inputDEM = r"C:\Workspace\DEMs\DEM.tif"         # Full path to input high resolution DEM (Geotif), which can represents topography in disturbed or undisturbed state (see Purpose)
+DEMres   =    1.0    # in meters                # Spatial resolution of the input DEM.
+bufferDist =  50.0   # in meters                # Buffer distance around each slump outline; the annulus between outline and buffer supplies the re-interpolation support.
+interpMethod = "IDW"                            # "IDW" for inverse-distance weighting over the k nearest exterior pixels (fastest), or "NN" for Delaunay-based linear interpolation where volume fidelity matters most.
+idwNeighbours = 8                               # Number of exterior pixels consulted per interior pixel when interpMethod is "IDW".
+keepIntermediates = False                       # Set to True to also write the per-slump clipped, predisturbance, DOD and squared-DOD GeoTIFFs to the 01_-03_ folders; the statistics themselves are computed fully in memory (perSlump mode only).
+processingMode = "perSlump"                     # "perSlump" processes each feature independently across worker processes; "grouped" reads the union window once, rasterizes all features into UniqueID grids and reduces every zone in a single pass - fastest for dense scenes of many small slumps, but the union window must fit in memory.
+
+## One rasterio dataset handle per worker process; handles cannot be shared across processes so each worker opens the DEM once on first use
+srchandles = {}
+
+def getsrc(dempath):
+    if dempath not in srchandles:
+        srchandles[dempath] = rasterio.open(dempath)
+    return srchandles[dempath]
+
+## Preallocated per-worker scratch buffers; windowed reads and raster arithmetic reuse slices of these instead of allocating a fresh array per slump
+scratchbufs = {}
+
+def initscratch(maxh, maxw):
+    for scratchname in ('clip', 'predis', 'dod', 'dodsq'):
+        scratchbufs[scratchname] = np.empty((maxh, maxw), dtype=np.float32)
+
+def getscratch(scratchname, bufh, bufw):
+    buf = scratchbufs.get(scratchname)
+    if buf is None or buf.shape[0] < bufh or buf.shape[1] < bufw:
+        buf = np.empty((bufh, bufw), dtype=np.float32)
+        scratchbufs[scratchname] = buf
+    return buf[:bufh, :bufw]
+
+## Weighted-average kernel for the IDW fill; the JIT build spreads interior pixels across cores with prange and lets the compiler vectorize the inner neighbour loop
+if numbaAvailable:
+    @njit(parallel=True, fastmath=True)
+    def idwfill(exteriorvals, idx, dist, out):
+        ## float32 constants keep the whole accumulation single precision (8 AVX2 lanes instead of 4)
+        for i in prange(idx.shape[0]):
+            wsum = np.float32(0.0)
+            vsum = np.float32(0.0)
+            for j in range(idx.shape[1]):
+                w = np.float32(1.0) / (dist[i, j] + np.float32(1e-6))
+                wsum += w
+                vsum += w * exteriorvals[idx[i, j]]
+            out[i] = vsum / wsum
+else:
+    def idwfill(exteriorvals, idx, dist, out):
+        weights = np.float32(1.0) / (dist + np.float32(1e-6))
+        out[:] = (weights * exteriorvals[idx]).sum(axis=1) / weights.sum(axis=1)
+
+def mortonkey(cx, cy):
+    """Interleave the bits of normalized centroid coordinates into a Z-order key; fallback spatial sort key when GeoSeries.hilbert_distance is unavailable."""
+    xi = np.floor(65535.0 * (cx - cx.min()) / ((cx.max() - cx.min()) or 1.0)).astype(np.uint64)
+    yi = np.floor(65535.0 * (cy - cy.min()) / ((cy.max() - cy.min()) or 1.0)).astype(np.uint64)
+    key = np.zeros_like(xi)
+    for b in range(16):
+        key |= ((xi >> b) & 1) << (2 * b)
+        key |= ((yi >> b) & 1) << (2 * b + 1)
+    return key
+
+def process_slump(rowclean, slumpgeom, bufbounds, dempath, basename, folders):
+    """Run Steps 2-8 (windowed read, predisturbance re-interpolation, DOD arithmetic and mask statistics) for one slump inside a worker process and return its statistics and RMSE rows."""
+
+    src = getsrc(dempath)
+    slumpprefix = f"{basename}_SlumpID_{rowclean}"
+
+    ## Step 2: Read only the DEM subarray covering the buffered feature extent through a rasterio window instead of clipping the full raster per feature
+    clipwin = from_bounds(bufbounds[0], bufbounds[1], bufbounds[2], bufbounds[3], src.transform)
+    clipwin = clipwin.round_offsets().round_lengths()
+    clipwin = clipwin.intersection(Window(0, 0, src.width, src.height))
+    ## float32 end-to-end: halves memory bandwidth and doubles SIMD throughput over the implicit float64 promotion; the read lands in the reused scratch buffer
+    cliparr = getscratch('clip', int(clipwin.height), int(clipwin.width))
+    src.read(1, window=clipwin, out=cliparr, boundless=False)
+    cliptransform = src.window_transform(clipwin)
+
+    ## Profile shared by all optional intermediate GeoTIFFs of this window
+    clipprofile = src.profile.copy()
+    clipprofile.update(height=cliparr.shape[0], width=cliparr.shape[1], transform=cliptransform, dtype='float32')
+
+    ## Persist the clipped DEM as GeoTIFF only when intermediates are requested; the statistics run entirely from the in-memory arrays
+    if keepIntermediates:
+        with rasterio.open(f"{folders['01_ClippedDEMs']}\\{slumpprefix}.tif", 'w', **clipprofile) as clipdst:
+            clipdst.write(cliparr, 1)
+        print(slumpprefix + " successfully clipped")
+
+    ## Step 3: Rasterize the unbuffered slump polygon onto the clipped window; interior pixels are re-interpolated from the exterior annulus (cannot rely solely on an intersect in case of overlapping randomized slump areas, hence the per-feature geometry)
+    slumpmask = rasterize([(slumpgeom, 1)], out_shape=cliparr.shape, transform=cliptransform).astype(bool)
+
+    ## Exclude NoData pixels from the interpolation support
+    exteriormask = ~slumpmask
+    if src.nodata is not None:
+        exteriormask = exteriormask & (cliparr != src.nodata)
+
+    ## Pixel-centre coordinate grids for the clipped window
+    colgrid, rowgrid = np.meshgrid(np.arange(cliparr.shape[1]), np.arange(cliparr.shape[0]))
+    xgrid = cliptransform.c + (colgrid + 0.5) * cliptransform.a
+    ygrid = cliptransform.f + (rowgrid + 0.5) * cliptransform.e
+
+    ## Step 5: Re-interpolate the interior pixels from the exterior annulus pixels to obtain the predisturbance DEM
+    exteriorpts = np.column_stack([xgrid[exteriormask], ygrid[exteriormask]])
+    exteriorvals = cliparr[exteriormask]
+    interiorpts = np.column_stack([xgrid[slumpmask], ygrid[slumpmask]])
+
+    if interpMethod == "IDW":
+        ## Inverse-distance weighting over the k nearest exterior pixels; one vectorized cKDTree query followed by the (JIT-compiled) fill kernel
+        tree = cKDTree(exteriorpts)
+        dist, idx = tree.query(interiorpts, k=idwNeighbours)
+        ## cKDTree works in float64 internally; cast the distances so the fill kernel stays float32
+        dist = dist.astype(np.float32)
+        fillvals = np.empty(interiorpts.shape[0], dtype=np.float32)
+        idwfill(exteriorvals, idx, dist, fillvals)
+    else:
+        ## Delaunay-based linear interpolation over the annulus (SciPy stand-in for the original Natural Neighbour surface)
+        tri = Delaunay(exteriorpts)
+        interp = LinearNDInterpolator(tri, exteriorvals)
+        fillvals = interp(interiorpts)
+        ## Interior pixels outside the convex hull (polygon touching the window edge) keep their original elevations
+        fillvals = np.where(np.isnan(fillvals), cliparr[slumpmask], fillvals)
+
+    predisarr = getscratch('predis', cliparr.shape[0], cliparr.shape[1])
+    np.copyto(predisarr, cliparr)
+    predisarr[slumpmask] = fillvals
+
+    ## Persist the predisturbance DEM as GeoTIFF only when intermediates are requested
+    if keepIntermediates:
+        with rasterio.open(f"{folders['02_PredisturbDEMs']}\\{slumpprefix}_predisturbance.tif", 'w', **clipprofile) as predisdst:
+            predisdst.write(predisarr, 1)
+
+    ## Step 6: Execute the DOD arithmetic directly on the in-memory arrays
+    dodarr = np.subtract(cliparr, predisarr, out=getscratch('dod', cliparr.shape[0], cliparr.shape[1]))
+    if keepIntermediates:
+        with rasterio.open(f"{folders['03_DODs']}\\{slumpprefix}_dod.tif", 'w', **clipprofile) as doddst:
+            doddst.write(dodarr, 1)
+
+    ## Step 7: Reduce the DOD directly over the rasterized slump mask into one statistics row per slump
+    ## NoData pixels inside the zone carry garbage DOD values (nodata minus interpolated); drop them from the reduction to match the original "DATA" zonal semantics
+    zonemask = slumpmask
+    if src.nodata is not None:
+        zonemask = slumpmask & (cliparr != src.nodata)
+    zonevals = dodarr[zonemask]
+
+    ## A sliver polygon can rasterize to zero cells, and a zone can be entirely NoData; emit a COUNT=0 row instead of aborting the whole batch on an empty reduction
+    if zonevals.size == 0:
+        statsrow = {'UniqueID': rowclean, 'COUNT': 0, 'MIN': float('nan'), 'MAX': float('nan'),
+                    'RANGE': float('nan'), 'MEAN': float('nan'), 'STD': float('nan'),
+                    'MEDIAN': float('nan'), 'PCT90': float('nan'), 'SUM': float('nan')}
+        rmserow = {'UniqueID': rowclean, 'COUNT': 0, 'MEAN': float('nan')}
+        print(slumpprefix + " has no valid zone pixels; COUNT=0 statistics written")
+        return statsrow, rmserow
+
+    statsrow = {'UniqueID': rowclean, 'COUNT': int(zonevals.size), 'MIN': float(zonevals.min()),
+                'MAX': float(zonevals.max()), 'RANGE': float(zonevals.max() - zonevals.min()),
+                'MEAN': float(zonevals.mean()), 'STD': float(zonevals.std()),
+                'MEDIAN': float(np.median(zonevals)), 'PCT90': float(np.percentile(zonevals, 90)),
+                'SUM': float(zonevals.sum())}
+
+    ## Step 8: Square the DOD in memory and reduce over the same mask for the RMSE row
+    dodsqarr = np.square(dodarr, out=getscratch('dodsq', dodarr.shape[0], dodarr.shape[1]))
+    if keepIntermediates:
+        with rasterio.open(f"{folders['03_DODs']}\\{slumpprefix}_dodsq.tif", 'w', **clipprofile) as dodsqdst:
+            dodsqdst.write(dodsqarr, 1)
+
+    sqvals = dodsqarr[zonemask]
+    rmserow = {'UniqueID': rowclean, 'COUNT': int(sqvals.size), 'MEAN': float(sqvals.mean())}
+
+    print(slumpprefix + " statistics successfully processed")
+    return statsrow, rmserow
+
+def colorlayers(gdf):
+    """Greedily colour overlapping polygons into non-overlapping layers; each layer can then be rasterized into one UniqueID grid without zones shadowing each other."""
+    geoms = gdf.geometry.values
+    sindex = gdf.sindex
+    layerids = np.full(len(geoms), -1, dtype=np.int64)
+    for i in range(len(geoms)):
+        used = set()
+        for j in sindex.query(geoms[i], predicate='intersects'):
+            if j != i and layerids[j] >= 0:
+                used.add(layerids[j])
+        layerid = 0
+        while layerid in used:
+            layerid += 1
+        layerids[i] = layerid
+    return layerids
+
+def process_grouped(gdf, dempath):
+    """Grouped one-pass variant of Steps 2-8: read the union window once, build a single predisturbance surface from all exterior pixels, rasterize the features into per-layer UniqueID grids and reduce every zone from the shared DOD array."""
+
+    src = getsrc(dempath)
+
+    ## Read the window covering all buffered features in one go
+    minx, miny, maxx, maxy = gdf.total_bounds
+    groupwin = from_bounds(minx - bufferDist, miny - bufferDist, maxx + bufferDist, maxy + bufferDist, src.transform)
+    groupwin = groupwin.round_offsets().round_lengths()
+    groupwin = groupwin.intersection(Window(0, 0, src.width, src.height))
+    grouparr = src.read(1, window=groupwin, out_dtype='float32')
+    grouptransform = src.window_transform(groupwin)
+
+    ## Valid-data mask shared by the interpolation support and the zone reductions
+    if src.nodata is not None:
+        validmask = grouparr != src.nodata
+    else:
+        validmask = np.ones(grouparr.shape, dtype=bool)
+
+    ## The interpolation support must exclude every disturbance, so mask the union of all slump interiors
+    allmask = rasterize([(geom, 1) for geom in gdf.geometry], out_shape=grouparr.shape, transform=grouptransform).astype(bool)
+    exteriormask = ~allmask & validmask
+
+    ## Pixel-centre coordinate grids for the union window
+    colgrid, rowgrid = np.meshgrid(np.arange(grouparr.shape[1]), np.arange(grouparr.shape[0]))
+    xgrid = grouptransform.c + (colgrid + 0.5) * grouptransform.a
+    ygrid = grouptransform.f + (rowgrid + 0.5) * grouptransform.e
+
+    ## One predisturbance fill for every interior pixel from the shared exterior support
+    exteriorpts = np.column_stack([xgrid[exteriormask], ygrid[exteriormask]])
+    exteriorvals = grouparr[exteriormask]
+    interiorpts = np.column_stack([xgrid[allmask], ygrid[allmask]])
+
+    if interpMethod == "IDW":
+        tree = cKDTree(exteriorpts)
+        dist, idx = tree.query(interiorpts, k=idwNeighbours)
+        dist = dist.astype(np.float32)
+        fillvals = np.empty(interiorpts.shape[0], dtype=np.float32)
+        idwfill(exteriorvals, idx, dist, fillvals)
+    else:
+        tri = Delaunay(exteriorpts)
+        interp = LinearNDInterpolator(tri, exteriorvals)
+        fillvals = interp(interiorpts)
+        fillvals = np.where(np.isnan(fillvals), grouparr[allmask], fillvals)
+
+    predisarr = grouparr.copy()
+    predisarr[allmask] = fillvals
+    dodarr = grouparr - predisarr
+    dodflat = dodarr.ravel()
+    validflat = validmask.ravel()
+
+    ## Reduce every zone in one sorted pass per colour layer; overlapping polygons land in different layers so no zone shadows another
+    layerids = colorlayers(gdf)
+    geoms = gdf.geometry.values
+    uids = gdf.index.to_numpy()
+    ## Background sentinel one below the smallest UniqueID; a plain fill of 0 would make a legitimate UniqueID of 0 indistinguishable from background and silently drop that zone
+    fillid = int(uids.min()) - 1
+    stats_rows = []
+    rmse_rows = []
+    for layerid in range(int(layerids.max()) + 1):
+        inlayer = layerids == layerid
+        uidgrid = rasterize(zip(geoms[inlayer], uids[inlayer]), out_shape=grouparr.shape, transform=grouptransform, fill=fillid, dtype='int32')
+        uidflat = uidgrid.ravel()
+        ## NoData pixels inside a zone carry garbage DOD values; drop them so grouped COUNT/SUM match the perSlump ("DATA") semantics
+        holes = (uidflat != fillid) & validflat
+        holeuids = uidflat[holes]
+        holevals = dodflat[holes]
+        order = np.argsort(holeuids, kind='stable')
+        holeuids = holeuids[order]
+        holevals = holevals[order]
+        groupids, groupstarts = np.unique(holeuids, return_index=True)
+        groupbounds = np.append(groupstarts, holeuids.size)
+        for g, rowclean in enumerate(groupids):
+            zonevals = holevals[groupbounds[g]:groupbounds[g + 1]]
+            stats_rows.append({'UniqueID': rowclean, 'COUNT': int(zonevals.size), 'MIN': float(zonevals.min()),
+                               'MAX': float(zonevals.max()), 'RANGE': float(zonevals.max() - zonevals.min()),
+                               'MEAN': float(zonevals.mean()), 'STD': float(zonevals.std()),
+                               'MEDIAN': float(np.median(zonevals)), 'PCT90': float(np.percentile(zonevals, 90)),
+                               'SUM': float(zonevals.sum())})
+            sqvals = np.square(zonevals)
+            rmse_rows.append({'UniqueID': rowclean, 'COUNT': int(sqvals.size), 'MEAN': float(sqvals.mean())})
+
+    ## Zones that rasterize to no cells or sit entirely on NoData never appear in the sweep; emit the same COUNT=0 rows as perSlump mode so both modes share one output contract
+    emitted = {int(statsrow['UniqueID']) for statsrow in stats_rows}
+    for rowclean in uids:
+        if int(rowclean) not in emitted:
+            stats_rows.append({'UniqueID': rowclean, 'COUNT': 0, 'MIN': float('nan'), 'MAX': float('nan'),
+                               'RANGE': float('nan'), 'MEAN': float('nan'), 'STD': float('nan'),
+                               'MEDIAN': float('nan'), 'PCT90': float('nan'), 'SUM': float('nan')})
+            rmse_rows.append({'UniqueID': rowclean, 'COUNT': 0, 'MEAN': float('nan')})
+            print("SlumpID " + str(rowclean) + " has no valid zone pixels; COUNT=0 statistics written")
+
+    print("grouped statistics successfully processed for " + str(len(stats_rows)) + " slumps in " + str(int(layerids.max()) + 1) + " layer(s)")
+    return stats_rows, rmse_rows
+
+def main():
+
+    totalstart = time.perf_counter()
+    print("Initialization Complete. Start time:",time.strftime("%c", time.localtime()))
+    print("")
+
+    ## A larger GDAL block cache (in MB) keeps recently decoded DEM tiles resident across the windowed reads
+    os.environ['GDAL_CACHEMAX'] = '2048'
+
+    ## Rewrite the input DEM once as an internally tiled GeoTIFF if it is striped; windowed reads then decode a handful of 512x512 blocks instead of full raster rows
+    dempath = inputDEM
+    with rasterio.open(inputDEM) as demcheck:
+        demtiled = demcheck.is_tiled
+    if not demtiled:
+        dempath = os.path.splitext(inputDEM)[0] + "_tiled.tif"
+        if not os.path.exists(dempath):
+            print(time.strftime("%X", time.localtime()), "  Input DEM is striped; converting once to tiled GeoTIFF " + dempath)
+            rasterio.shutil.copy(inputDEM, dempath, driver='GTiff', tiled=True, blockxsize=512, blockysize=512, compress='deflate')
+
+    # Initiate loop; plain directory globbing avoids the ArcGIS catalog walk of ListFeatureClasses
+    inputVector = sorted(glob.glob(os.path.join(wspace, "*.shp")))
+    print("The following vector files will be considered: " + str(inputVector))
+
+    ## Per-shapefile statistics tables are kept here so the cross-shapefile merge is a single concatenation at the end
+    allstatsframes = []
+    allrmseframes = []
+
+    ### strings for the output folders; names are run invariants, so the joined paths are built once into a dict and the folders created once before the loop (intermediate folders only when requested)
+    folders = {foldername: os.path.join(wspace, foldername)
+               for foldername in ("01_ClippedDEMs", "02_PredisturbDEMs", "03_DODs", "06_FinalZonalStats", "07_FinalRMSEStats")}
+    for foldername, folderpath in folders.items():
+        if keepIntermediates or foldername in ("06_FinalZonalStats", "07_FinalRMSEStats"):
+            if not os.path.exists(folderpath): os.makedirs(folderpath)
+
+    for slumpset in inputVector:
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Steps 1-8: Extract geometries and dispatch the per-slump pipeline across worker processes
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+        print(time.strftime("%X", time.localtime()), "  Start per-slump processing")
+        clip_start = time.perf_counter()
+
+        ### Base name of the current shapefile for file naming
+        basename = os.path.splitext(os.path.basename(slumpset))[0]
+
+        ## Load the shapefile once into a GeoDataFrame indexed by UniqueID; a single indexed lookup replaces the per-feature attribute selections and cursors
+        gdf = gpd.read_file(slumpset).set_index('UniqueID')
+
+        ## Order features along a space-filling curve so clustered slumps are processed consecutively and re-use warm GDAL block-cache entries
+        try:
+            gdf = gdf.iloc[np.argsort(gdf.geometry.hilbert_distance().to_numpy())]
+        except AttributeError:
+            ## Older GeoPandas without hilbert_distance: Morton (Z-order) key from the feature centroids
+            centroids = gdf.geometry.centroid
+            gdf = gdf.iloc[np.argsort(mortonkey(centroids.x.to_numpy(), centroids.y.to_numpy()))]
+
+        if processingMode == "grouped":
+            ## Grouped mode: one union-window read and one reduction pass over per-layer UniqueID grids for the whole shapefile
+            stats_rows, rmse_rows = process_grouped(gdf, dempath)
+        else:
+            ## Collect geometry and buffered extent of every feature in a single pass so the loop body can run in parallel; the GEOS buffer replaces the Buffer_analysis shapefile write
+            slumptasks = []
+            for feature in gdf.itertuples():
+                slumptasks.append((feature.Index, feature.geometry, feature.geometry.buffer(bufferDist).bounds))
+
+            ## Size the per-worker scratch buffers once from the largest buffered bounding box of this shapefile
+            maxh = max(int(math.ceil((bufbounds[3] - bufbounds[1]) / DEMres)) + 2 for _, _, bufbounds in slumptasks)
+            maxw = max(int(math.ceil((bufbounds[2] - bufbounds[0]) / DEMres)) + 2 for _, _, bufbounds in slumptasks)
+
+            ## Dispatch the per-slump pipeline across worker processes; each feature is independent once the geometries are extracted
+            stats_rows = []
+            rmse_rows = []
+            with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=initscratch, initargs=(maxh, maxw)) as pool:
+                futures = [pool.submit(process_slump, rowclean, slumpgeom, bufbounds, dempath, basename, folders)
+                           for rowclean, slumpgeom, bufbounds in slumptasks]
+                for future in concurrent.futures.as_completed(futures):
+                    statsrow, rmserow = future.result()
+                    stats_rows.append(statsrow)
+                    rmse_rows.append(rmserow)
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Step 9: Write the accumulated summary statistics once per shapefile
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+        ## Retrieve input vector name from which to concatenate with final statistics name for the single table output
+        fTablename = f"{basename}_FinalStatistics.csv"
+        fTableoutput = f"{folders['06_FinalZonalStats']}\\{fTablename}"
+
+        ## Write the accumulated per-slump rows in one pass, restoring feature order scrambled by as_completed
+        statsdf = pd.DataFrame(stats_rows).sort_values('UniqueID', ignore_index=True)
+        statsdf.to_csv(fTableoutput, index=False)
+        allstatsframes.append(statsdf)
+
+        print(fTablename + " successfully processed")
+        print("")
+
+        ### Report happy ending for iteration
+        clip_end = time.perf_counter()
+        clip_elapsed = clip_end - clip_start
+        clip_elapsedmin = clip_elapsed / 60
+        clip_elapsedhr = clip_elapsedmin / 60
+        print(time.strftime("%X", time.localtime()), "  iteration ran successfully")
+        print("Area/volume processing time for iteration: " + str(round(clip_elapsed,0)) + " seconds " + " or " + str(round(clip_elapsedmin,1)) + " minutes " + " or " + str(round(clip_elapsedhr,4)) + " hours ")
+        print(" ")
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Step 10: Write the accumulated RMSE statistics once per shapefile
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+        ## Retrieve input vector name from which to concatenate with final statistics name for the single table output
+        frmseTablename = f"{basename}_FinalRMSE.csv"
+        frmseTableoutput = f"{folders['07_FinalRMSEStats']}\\{frmseTablename}"
+
+        ## Write the accumulated per-slump rows in one pass, restoring feature order scrambled by as_completed
+        rmsedf = pd.DataFrame(rmse_rows).sort_values('UniqueID', ignore_index=True)
+        rmsedf.to_csv(frmseTableoutput, index=False)
+        allrmseframes.append(rmsedf)
+
+        print(frmseTablename + " successfully processed")
+        print("")
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Step 11: Merge zonal statistics of all iterations together
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    ## Concatenate the per-shapefile tables kept in memory into the single merged output
+    fsTablename = f"{basename}_FinalStatistics_merged.csv"
+    fsTableoutput = f"{folders['06_FinalZonalStats']}\\{fsTablename}"
+    pd.concat(allstatsframes, ignore_index=True).to_csv(fsTableoutput, index=False)
+
+    print(fsTablename + " successfully processed")
+    print("")
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+# Step 12: Merge RMSE statistics of all iterations together
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    ## Concatenate the per-shapefile tables kept in memory into the single merged output
+    fmrmseTablename = f"{basename}_FinalRMSE_merged.csv"
+    fmrmseTableoutput = f"{folders['07_FinalRMSEStats']}\\{fmrmseTablename}"
+    pd.concat(allrmseframes, ignore_index=True).to_csv(fmrmseTableoutput, index=False)
+
+    print(fmrmseTablename + " successfully processed")
+    print("")
+
+    ### Report happy ending for iteration
+    totalend = time.perf_counter()
+    total_elapsed = totalend - totalstart
+    total_elapsedmin = total_elapsed / 60
+    total_elapsedhr = total_elapsedmin / 60
+    print(time.strftime("%X", time.localtime()), "  script ran successfully")
+    print("Area/volume processing time for script: " + str(round(total_elapsed,0)) + " seconds " + " or " + str(round(total_elapsedmin,1)) + " minutes " + " or " + str(round(total_elapsedhr,4)) + " hours ")
+    print(" ")
+
+## Guard required for Windows process spawning
+if __name__ == '__main__':
+    main()